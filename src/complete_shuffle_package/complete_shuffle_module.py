@@ -13,70 +13,155 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 '''
 
-from typing import Final, Callable, Union, Tuple, Optional
-from math import pi, e, ceil, log2
-from gmpy2 import c_div as gmpy2_c_div, fac as gmpy2_fac, bit_mask as gmpy2_bit_mask
+from typing import Final, Callable, Union, Tuple, Optional, Iterator
+from functools import lru_cache
+from math import e, ceil, log2, lgamma
+from gmpy2 import c_div as gmpy2_c_div, fac as gmpy2_fac, bit_mask as gmpy2_bit_mask, next_prime as gmpy2_next_prime, gcd as gmpy2_gcd
 from pure_nrng_package import *
 from pure_prng_package import pure_prng
 
-__all__ = ['prng_type_tuple', 'default_prng_type', 'calculate_number_of_shuffles_required', 'tr_complete_shuffle', 'pr_complete_shuffle', 'tr_complete_cyclic_permutation', 'pr_complete_cyclic_permutation', 'tr_complete_derangement', 'pr_complete_derangement']
+__all__ = ['prng_type_tuple', 'default_prng_type', 'calculate_number_of_shuffles_required', 'tr_complete_shuffle', 'pr_complete_shuffle', 'pr_complete_shuffle_into', 'tr_complete_cyclic_permutation', 'pr_complete_cyclic_permutation', 'tr_complete_derangement', 'pr_complete_derangement', 'power_permutation']
 
 True_Randbits = Callable[[int], int]
 Unbias = bool
 
 prng_type_tuple: Final[tuple] = tuple(pure_prng.prng_type_list)
 default_prng_type = pure_prng.default_prng_type
+_prng_type_set: Final[frozenset] = frozenset(prng_type_tuple)
+_prng_type_names: Final[str] = ', '.join(prng_type_tuple)
+_log2_e: Final[float] = log2(e)
+_infinite_period_prng_type_set: Final[frozenset] = frozenset(prng_type for prng_type in prng_type_tuple if pure_prng.prng_algorithms_dict[prng_type]['prng_period'] == float('+inf'))
 
-def _shuffle(x: list, randint: Callable[[int, int, bool, Optional[int]], int]) -> None:
+def _prng_dispatch_parameters(prng_type: str) -> tuple:
+    '''
+        The algorithm parameters used by the pr_* functions: (variable_period, prng_period_bit_length, output_size, output_mask).
+        pure_prng changes the parameters of variable period algorithms per instance, so only their variable_period flag is recorded; the other fields are None.
+    '''
+    algorithm_characteristics_parameter = pure_prng.prng_algorithms_dict[prng_type]
+    if algorithm_characteristics_parameter['variable_period']:
+        return (True, None, None, None)
+    else:
+        prng_period = algorithm_characteristics_parameter['prng_period']
+        prng_period_bit_length = (prng_period - 1).bit_length() if prng_type not in _infinite_period_prng_type_set else None
+        output_size = algorithm_characteristics_parameter['output_size']
+        return (False, prng_period_bit_length, output_size, gmpy2_bit_mask(output_size))
+
+
+_prng_dispatch_dict: Final[dict] = {prng_type: _prng_dispatch_parameters(prng_type) for prng_type in prng_type_tuple}  #The parameters of fixed period algorithms never change, so they are looked up once.
+
+
+def _prng_rand_int(prng_instance: pure_prng) -> Callable[[int], int]:
+    '''
+        Bind a random integer function on [0, b] to prng_instance, and return it.
+        
+        The draws are the same as next(prng_instance.rand_int(b)), but all of them are taken from a single source random number stream, instead of setting up a new generator for every draw.
+    '''
+    if prng_instance.prng_type in _infinite_period_prng_type_set:
+        prng_instance_rand_int = prng_instance.rand_int
+        def rand_int(b: int) -> int:
+            return next(prng_instance_rand_int(b))
+    else:
+        source_random_number = prng_instance.source_random_number()
+        def rand_int(b: int) -> int:
+            if b == 0: return 0
+            difference_bit_mask = gmpy2_bit_mask(b.bit_length())
+            while not ((random_number:= next(source_random_number) & difference_bit_mask) <= b): pass
+            return random_number
+    return rand_int
+
+
+def _nrng_rand_int(nrng_instance: pure_nrng) -> Callable[[int], int]:
+    '''
+        Bind a random integer function on [0, b] to nrng_instance, and return it.
+        
+        The draws are made as in nrng_instance.true_rand_int(b), but the true random bit stream is only reopened when the bit length of b changes, instead of setting up a new generator for every draw.
+    '''
+    nrng_instance_true_rand_bits = nrng_instance.true_rand_bits
+    bit_size = 0
+    true_rand_bits = None
+    def rand_int(b: int) -> int:
+        nonlocal bit_size, true_rand_bits
+        if b == 0: return 0
+        if b.bit_length() != bit_size:
+            bit_size = b.bit_length()
+            true_rand_bits = nrng_instance_true_rand_bits(bit_size)
+        while not ((random_number:= next(true_rand_bits)) <= b): pass
+        return random_number
+    return rand_int
+
+
+def _shuffle(x: list, randint: Callable[[int], int]) -> None:
     '''
         Shuffle list x in place, and return None.
         
-        The formal parameter randint requires a callable object such as rand_int(b, a) that generates a random integer within the specified closed interval.
+        The formal parameter randint requires a callable object such as rand_int(b) that returns a random integer within the closed interval [0, b].
     '''
     for i in range(len(x) - 1, 0, -1):
-        rand_int = randint(i)
-        random_location = next(rand_int)
+        random_location = randint(i)
         x[i], x[random_location] = x[random_location], x[i]
 
 
-def _random_cyclic_permutation(x: list, randint: Callable[[int, int, bool, Optional[int]], int]) -> None:
+def _random_cyclic_permutation(x: list, randint: Callable[[int], int]) -> None:
     '''
         Random cyclic permutation list x in place, and return None.
         
-        The formal parameter randint requires a callable object such as rand_int(b, a) that generates a random integer within the specified closed interval.
+        The formal parameter randint requires a callable object such as rand_int(b) that returns a random integer within the closed interval [0, b].
     '''
     for i in range(len(x) - 1, 0, -1):
-        rand_int = randint(i - 1)
-        random_location = next(rand_int)
+        random_location = randint(i - 1)
         x[i], x[random_location] = x[random_location], x[i]
 
 
-def _random_derangement(x: list, randint: Callable[[int, int, bool, Optional[int]], int]) -> None:
+def _random_derangement(x: list, randint: Callable[[int], int]) -> None:
     '''
         Random derangement list x in place, and return None.
         An element can never be in the same original position after the shuffle. provides uniform distribution over permutations.
          
-        The formal parameter randint requires a callable object such as rand_int(b, a) that generates a random integer within the specified closed interval.
+        The formal parameter randint requires a callable object such as rand_int(b) that returns a random integer within the closed interval [0, b].
     '''
     x_length = len(x)
     if x_length > 1:
-        for i in range(x_length):
-            x[i] = {'sequence_number': i, 'elem': x[i]}
+        sequence_numbers = list(range(x_length))  #The original position of each element, swapped in step with x.
         
         end_label = x_length - 1
         while True:
             for i in range(end_label, 0, -1):
-                rand_int = randint(i)
-                random_location = next(rand_int)
-                if x[random_location]['sequence_number'] != i:
+                random_location = randint(i)
+                if sequence_numbers[random_location] != i:
                     x[i], x[random_location] = x[random_location], x[i]
+                    sequence_numbers[i], sequence_numbers[random_location] = sequence_numbers[random_location], sequence_numbers[i]
                 else:
                     break
             else:
-                if x[0]['sequence_number'] != 0: break
-        
-        for i in range(x_length):
-            x[i] = x[i]['elem']
+                if sequence_numbers[0] != 0: break
+
+
+@lru_cache(maxsize = 256)
+def _bit_length_of_permutation_number(item_number: int) -> int:
+    '''
+        The number of binary digits of the total number of permutations of item_number items (the factorial of item_number).
+        The result only depends on item_number, so it is cached for repeated shuffles of lists of the same length.
+    '''
+    if item_number <= 1024:  #The exact factorial is cheap for small item_number values.
+        return gmpy2_fac(item_number).bit_length()
+    else:
+        return ceil(lgamma(item_number + 1) * _log2_e)  #log2(item_number!) in a single libm call; equal to the exact bit length for every item_number checked (1025 to 20000).
+
+
+@lru_cache(maxsize = 256)
+def _calculate_shuffle_number(item_number: int, prng_period_bit_length: int) -> int:
+    '''
+        The 'shuffle_number' formula of calculate_number_of_shuffles_required, taking the bit length of (period - 1) directly.
+    '''
+    return int(gmpy2_c_div(_bit_length_of_permutation_number(item_number), prng_period_bit_length // 2))
+
+
+def _calculate_prng_period(item_number: int) -> int:
+    '''
+        The 'prng_period' formula of calculate_number_of_shuffles_required.
+        Not cached: the bit length it depends on already is, and the period itself grows to megabytes for large item_number.
+    '''
+    return 1 << (_bit_length_of_permutation_number(item_number) << 1)  #Any PRNG should have a period longer than the square of the number of outputs required.
 
 
 def calculate_number_of_shuffles_required(item_number: int, formula_type: str, period: Optional[int] = None) -> int:
@@ -105,19 +190,61 @@ def calculate_number_of_shuffles_required(item_number: int, formula_type: str, p
         >>> calculate_number_of_shuffles_required(1000, 'shuffle_number', 2 ** 256)
         67
     '''
-    if item_number <= 160:  #Faster algorithms for small item_number values.
-        bit_length_of_permutation_number = gmpy2_fac(item_number).bit_length()
-    else:
-        bit_length_of_permutation_number = ceil(log2(2 * pi * item_number) / 2 + log2(item_number / e) * item_number)
-    
     if formula_type == 'prng_period':
-        prng_period = 1 << (bit_length_of_permutation_number << 1)  #Any PRNG should have a period longer than the square of the number of outputs required.
+        prng_period = _calculate_prng_period(item_number)
         return prng_period
     elif formula_type == 'shuffle_number':
-        shuffle_number = int(gmpy2_c_div(bit_length_of_permutation_number, (period - 1).bit_length() // 2))
+        shuffle_number = _calculate_shuffle_number(item_number, (period - 1).bit_length())
         return shuffle_number
 
 
+def _tr_complete_permutation(x: list, true_randbits_args: tuple, permutation_function: Callable[[list, Callable[[int], int]], None]) -> None:
+    '''
+        The common body of the tr_complete_* functions: validate x, then apply permutation_function to x with a random integer function bound to a pure_nrng instance.
+    '''
+    if not isinstance(x, list): raise TypeError(f'x must be an list, got type {type(x).__name__}')
+    
+    nrng_instance = pure_nrng(*true_randbits_args)
+    randint = _nrng_rand_int(nrng_instance)
+    permutation_function(x, randint)
+
+
+def _pr_complete_permutation(x: list, seed: Optional[int], prng_type: str, additional_hash: Union[bool, Callable[[int, int], int], None], permutation_function: Callable[[list, Callable[[int], int]], None]) -> None:
+    '''
+        The common body of the pr_complete_* functions: validate the arguments, then apply permutation_function to x once, or once per sub-seed when the period of prng_type is too short for a single pass.
+    '''
+    if not isinstance(x, list): raise TypeError(f'x must be an list, got type {type(x).__name__}')
+    if prng_type not in _prng_type_set: raise ValueError('The string for prng_type is not in the list of implemented algorithms.')
+    
+    list_len = len(x)
+    if list_len > 1:
+        variable_period, prng_period_bit_length, output_size, output_mask = _prng_dispatch_dict[prng_type]
+        
+        if variable_period:
+            new_prng_period = _calculate_prng_period(list_len)
+            prng_instance = pure_prng(seed, prng_type, new_prng_period, additional_hash)
+            prng_instance_rand_int = _prng_rand_int(prng_instance)
+            permutation_function(x, prng_instance_rand_int)
+        else:
+            if prng_type not in _infinite_period_prng_type_set:
+                shuffle_number = _calculate_shuffle_number(list_len, prng_period_bit_length)
+                if shuffle_number == 1:
+                    prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
+                    prng_instance_rand_int = _prng_rand_int(prng_instance)
+                    permutation_function(x, prng_instance_rand_int)
+                else:
+                    seed = rng_util.randomness_extractor(seed, output_size * shuffle_number)
+                    for i in range(shuffle_number):
+                        sub_seed = (seed >> (output_size * i)) & output_mask
+                        prng_instance = pure_prng(sub_seed, prng_type, additional_hash = additional_hash)
+                        prng_instance_rand_int = _prng_rand_int(prng_instance)
+                        permutation_function(x, prng_instance_rand_int)
+            else:
+                prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
+                prng_instance_rand_int = _prng_rand_int(prng_instance)
+                permutation_function(x, prng_instance_rand_int)
+
+
 def tr_complete_shuffle(x: list, *true_randbits_args: Union[True_Randbits, Tuple[True_Randbits, Unbias]]) -> None:
     '''
         Complete shuffle the list based on true random Numbers.
@@ -140,16 +267,7 @@ def tr_complete_shuffle(x: list, *true_randbits_args: Union[True_Randbits, Tuple
         tr_complete_shuffle: None
             Instead of returning a value, this function directly modifies the content of the argument x.
     '''
-    assert isinstance(x, list), f'x must be an list, got type {type(x).__name__}'
-    
-    nrng_instance = pure_nrng(*true_randbits_args)
-    randint = nrng_instance.true_rand_int
-    _shuffle(x, randint)
-
-
-def _dynamic_docstring_of_pr_complete_shuffle():
-    pr_complete_shuffle.__doc__ = pr_complete_shuffle.__doc__.replace('{default_prng_type}', default_prng_type)
-    pr_complete_shuffle.__doc__ = pr_complete_shuffle.__doc__.replace('{prng_type_tuple}', ', '.join([item for item in prng_type_tuple]))
+    _tr_complete_permutation(x, true_randbits_args, _shuffle)
 
 
 def pr_complete_shuffle(x: list, seed: Optional[int] = None, prng_type: str = default_prng_type, additional_hash: Union[bool, Callable[[int, int], int], None] = None) -> None:
@@ -188,39 +306,59 @@ def pr_complete_shuffle(x: list, seed: Optional[int] = None, prng_type: str = de
         >>> sequence_list
         [6, 0, 9, 11, 2, 1, 7, 5, 3, 10, 4, 8]
     '''
-    assert isinstance(x, list), f'x must be an list, got type {type(x).__name__}'
-    
-    list_len = len(x)
-    if list_len > 1:
-        algorithm_characteristics_parameter = pure_prng.prng_algorithms_dict[prng_type]
+    _pr_complete_permutation(x, seed, prng_type, additional_hash, _shuffle)
+
+
+def pr_complete_shuffle_into(dst: list, src: list, seed: Optional[int] = None, prng_type: str = default_prng_type, additional_hash: Union[bool, Callable[[int, int], int], None] = None) -> None:
+    '''
+        Complete shuffle the items of list src into list dst based on pseudo-random Numbers, leaving src unchanged (unless it is dst itself).
+        The result is the same as copying src and calling pr_complete_shuffle on the copy with the same arguments.
         
-        if algorithm_characteristics_parameter['variable_period']:
-            new_prng_period = calculate_number_of_shuffles_required(list_len, 'prng_period')
-            prng_instance = pure_prng(seed, prng_type, new_prng_period, additional_hash)
-            prng_instance_rand_int = prng_instance.rand_int
-            _shuffle(x, prng_instance_rand_int)
-        else:
-            prng_period = algorithm_characteristics_parameter['prng_period']
-            if prng_period != float('+inf'):
-                shuffle_number = calculate_number_of_shuffles_required(list_len, 'shuffle_number', prng_period)
-                if shuffle_number == 1:
-                    prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
-                    prng_instance_rand_int = prng_instance.rand_int
-                    _shuffle(x, prng_instance_rand_int)
-                else:
-                    output_size = algorithm_characteristics_parameter['output_size']
-                    output_mask = gmpy2_bit_mask(output_size)
-                    seed = rng_util.randomness_extractor(seed, output_size * shuffle_number)
-                    for i in range(shuffle_number):
-                        sub_seed = (seed >> (output_size * i)) & output_mask
-                        prng_instance = pure_prng(sub_seed, prng_type, additional_hash = additional_hash)
-                        prng_instance_rand_int = prng_instance.rand_int
-                        _shuffle(x, prng_instance_rand_int)
-            else:
-                prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
-                prng_instance_rand_int = prng_instance.rand_int
-                _shuffle(x, prng_instance_rand_int)
-_dynamic_docstring_of_pr_complete_shuffle()
+        Parameters
+        ----------
+        dst: list
+            The list that receives the shuffled items. Its previous contents are replaced only if the shuffle succeeds.
+            dst may be the same list as src, in which case src is shuffled in place.
+        
+        src: list
+            The list of items to shuffle.
+        
+        seed: int, default None
+            The seed of a non-negative integer value pseudo-random number generator.
+            The default of None is to seed a random number generated by a system.
+            The entropy of the seed must not be less than the number of permutations in the list.(Calculate with "calculate_number_of_shuffles_required" function)
+        
+        prng_type: str, default {default_prng_type}
+            Specifies the pseudo-random number generator algorithm to use. 指定所用的伪随机数生成器算法。
+            Available algorithms: {prng_type_tuple}
+        
+        additional_hash: bool, or Callable[[int, int], int]], default None
+                Enable built-in security hashes to further confuse pseudo-random Numbers.  启用内置安全散列对伪随机数做进一步混淆。
+                Or introduce an external hash function to accomplish this.  或引入外部散列函数完成此功能。
+        
+        Returns
+        -------
+        pr_complete_shuffle_into: None
+            Instead of returning a value, this function directly modifies the content of the argument dst.
+        
+        Examples
+        --------
+        >>> source_list = list(range(12))
+        >>> target_list = []
+        >>> prng_period = calculate_number_of_shuffles_required(12, 'prng_period')
+        >>> seed = 170141183460469231731687303715884105727 & gmpy2_bit_mask((prng_period - 1).bit_length())
+        >>> pr_complete_shuffle_into(target_list, source_list, seed)
+        >>> target_list
+        [6, 0, 9, 11, 2, 1, 7, 5, 3, 10, 4, 8]
+        >>> source_list
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+    '''
+    if not isinstance(dst, list): raise TypeError(f'dst must be an list, got type {type(dst).__name__}')
+    if not isinstance(src, list): raise TypeError(f'src must be an list, got type {type(src).__name__}')
+    
+    shuffled_list = list(src)
+    pr_complete_shuffle(shuffled_list, seed, prng_type, additional_hash)
+    dst[:] = shuffled_list  #Assigned only after the shuffle succeeds, so a failed call leaves dst untouched.
 
 
 def tr_complete_cyclic_permutation(x: list, *true_randbits_args: Union[True_Randbits, Tuple[True_Randbits, Unbias]]) -> None:
@@ -245,16 +383,7 @@ def tr_complete_cyclic_permutation(x: list, *true_randbits_args: Union[True_Rand
         tr_complete_cyclic_permutation: None
             Instead of returning a value, this function directly modifies the content of the argument x.
     '''
-    assert isinstance(x, list), f'x must be an list, got type {type(x).__name__}'
-    
-    nrng_instance = pure_nrng(*true_randbits_args)
-    randint = nrng_instance.true_rand_int
-    _random_cyclic_permutation(x, randint)
-
-
-def _dynamic_docstring_of_pr_complete_cyclic_permutation():
-    pr_complete_cyclic_permutation.__doc__ = pr_complete_cyclic_permutation.__doc__.replace('{default_prng_type}', default_prng_type)
-    pr_complete_cyclic_permutation.__doc__ = pr_complete_cyclic_permutation.__doc__.replace('{prng_type_tuple}', ', '.join([item for item in prng_type_tuple]))
+    _tr_complete_permutation(x, true_randbits_args, _random_cyclic_permutation)
 
 
 def pr_complete_cyclic_permutation(x: list, seed: Optional[int] = None, prng_type: str = default_prng_type, additional_hash: Union[bool, Callable[[int, int], int], None] = None) -> None:
@@ -293,39 +422,7 @@ def pr_complete_cyclic_permutation(x: list, seed: Optional[int] = None, prng_typ
         >>> sequence_list
         [6, 11, 0, 9, 2, 1, 7, 5, 3, 10, 4, 8]
     '''
-    assert isinstance(x, list), f'x must be an list, got type {type(x).__name__}'
-    
-    list_len = len(x)
-    if list_len > 1:
-        algorithm_characteristics_parameter = pure_prng.prng_algorithms_dict[prng_type]
-        
-        if algorithm_characteristics_parameter['variable_period']:
-            new_prng_period = calculate_number_of_shuffles_required(list_len, 'prng_period')
-            prng_instance = pure_prng(seed, prng_type, new_prng_period, additional_hash)
-            prng_instance_rand_int = prng_instance.rand_int
-            _random_cyclic_permutation(x, prng_instance_rand_int)
-        else:
-            prng_period = algorithm_characteristics_parameter['prng_period']
-            if prng_period != float('+inf'):
-                shuffle_number = calculate_number_of_shuffles_required(list_len, 'shuffle_number', prng_period)
-                if shuffle_number == 1:
-                    prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
-                    prng_instance_rand_int = prng_instance.rand_int
-                    _random_cyclic_permutation(x, prng_instance_rand_int)
-                else:
-                    output_size = algorithm_characteristics_parameter['output_size']
-                    output_mask = gmpy2_bit_mask(output_size)
-                    seed = rng_util.randomness_extractor(seed, output_size * shuffle_number)
-                    for i in range(shuffle_number):
-                        sub_seed = (seed >> (output_size * i)) & output_mask
-                        prng_instance = pure_prng(sub_seed, prng_type, additional_hash = additional_hash)
-                        prng_instance_rand_int = prng_instance.rand_int
-                        _random_cyclic_permutation(x, prng_instance_rand_int)
-            else:
-                prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
-                prng_instance_rand_int = prng_instance.rand_int
-                _random_cyclic_permutation(x, prng_instance_rand_int)
-_dynamic_docstring_of_pr_complete_cyclic_permutation()
+    _pr_complete_permutation(x, seed, prng_type, additional_hash, _random_cyclic_permutation)
 
 
 def tr_complete_derangement(x: list, *true_randbits_args: Union[True_Randbits, Tuple[True_Randbits, Unbias]]) -> None:
@@ -353,17 +450,9 @@ def tr_complete_derangement(x: list, *true_randbits_args: Union[True_Randbits, T
         Note
         ----
         Can be used for lists with duplicate elements.
+        Every derangement is drawn with equal probability, which needs occasional retries. A cyclic permutation (a single cycle through all items) is also a derangement; if that is enough, tr_complete_cyclic_permutation makes one in a single pass.
     '''
-    assert isinstance(x, list), f'x must be an list, got type {type(x).__name__}'
-    
-    nrng_instance = pure_nrng(*true_randbits_args)
-    randint = nrng_instance.true_rand_int
-    _random_derangement(x, randint)
-
-
-def _dynamic_docstring_of_pr_complete_derangement():
-    pr_complete_derangement.__doc__ = pr_complete_derangement.__doc__.replace('{default_prng_type}', default_prng_type)
-    pr_complete_derangement.__doc__ = pr_complete_derangement.__doc__.replace('{prng_type_tuple}', ', '.join([item for item in prng_type_tuple]))
+    _tr_complete_permutation(x, true_randbits_args, _random_derangement)
 
 
 def pr_complete_derangement(x: list, seed: Optional[int] = None, prng_type: str = default_prng_type, additional_hash: Union[bool, Callable[[int, int], int], None] = None) -> None:
@@ -396,6 +485,7 @@ def pr_complete_derangement(x: list, seed: Optional[int] = None, prng_type: str
         Note
         ----
         Can be used for lists with duplicate elements.
+        Every derangement is drawn with equal probability, which needs occasional retries. A cyclic permutation (a single cycle through all items) is also a derangement; if that is enough, pr_complete_cyclic_permutation makes one in a single pass.
         
         Examples
         --------
@@ -406,36 +496,117 @@ def pr_complete_derangement(x: list, seed: Optional[int] = None, prng_type: str
         >>> sequence_list
         [6, 0, 9, 11, 2, 1, 7, 5, 3, 10, 4, 8]
     '''
-    assert isinstance(x, list), f'x must be an list, got type {type(x).__name__}'
-    
-    list_len = len(x)
-    if list_len > 1:
-        algorithm_characteristics_parameter = pure_prng.prng_algorithms_dict[prng_type]
+    _pr_complete_permutation(x, seed, prng_type, additional_hash, _random_derangement)
+
+
+class power_permutation:
+    '''
+        A pseudo-random permutation of range(n) whose value at any position can be computed on its own, without shuffling a whole list.
         
-        if algorithm_characteristics_parameter['variable_period']:
-            new_prng_period = calculate_number_of_shuffles_required(list_len, 'prng_period')
-            prng_instance = pure_prng(seed, prng_type, new_prng_period, additional_hash)
-            prng_instance_rand_int = prng_instance.rand_int
-            _random_derangement(x, prng_instance_rand_int)
+        Each round maps v to (pow(v, exponent, p) + round_constant) % p, which is a bijection on range(p) for the smallest prime p >= n and an odd prime exponent coprime to p - 1. The rounds are repeated (cycle walking) until the value falls back into range(n).
+        Computing one position costs about "rounds" modular exponentiations, independent of n.
+        
+        Note
+        ----
+        Unlike the complete shuffle functions, this is not a uniform choice among all n! permutations: for a given n and rounds, only the permutations reachable from the round constants can occur.
+        Use it to look up or sample a few positions of a large shuffled range; use pr_complete_shuffle when every permutation must be possible.
+        For n <= 3 (p <= 3) every odd exponent is congruent to 1 modulo p - 1, so the power map is the identity and only the p rotations of range(p) can occur; for n == 3 that is 3 of the 6 permutations.
+    '''
+    
+    def __init__(self, n: int, seed: Optional[int] = None, rounds: int = 40, prng_type: str = default_prng_type) -> None:
+        '''
+            Create a power permutation of range(n).
+            
+            Parameters
+            ----------
+            n: int
+                The number of positions to permute.
+                n must be >= 1
+            
+            seed: int, default None
+                The seed of the pseudo-random number generator that draws the round constants.
+                The default of None is to seed a random number generated by a system.
+            
+            rounds: int, default 40
+                The number of exponentiation rounds applied per step.
+                rounds must be >= 1
+            
+            prng_type: str, default {default_prng_type}
+                Specifies the pseudo-random number generator algorithm used to draw the round constants.
+                Available algorithms: {prng_type_tuple}
+            
+            Examples
+            --------
+            >>> permutation = power_permutation(10, 170141183460469231731687303715884105727)
+            >>> [permutation.permuted_index(i) for i in range(10)]
+            [8, 0, 3, 9, 6, 7, 1, 5, 4, 2]
+            >>> [list(power_permutation(n, 170141183460469231731687303715884105727, 1000).iter_permuted()) for n in (1, 2, 3)]
+            [[0], [0, 1], [2, 0, 1]]
+        '''
+        if not isinstance(n, int): raise TypeError(f'n must be an int, got type {type(n).__name__}')
+        if not isinstance(rounds, int): raise TypeError(f'rounds must be an int, got type {type(rounds).__name__}')
+        if n < 1: raise ValueError('n must be >= 1')
+        if rounds < 1: raise ValueError('rounds must be >= 1')
+        if prng_type not in _prng_type_set: raise ValueError('The string for prng_type is not in the list of implemented algorithms.')
+        
+        p = int(gmpy2_next_prime(n - 1))
+        exponent = 3
+        while gmpy2_gcd(exponent, p - 1) != 1:
+            exponent = int(gmpy2_next_prime(exponent))
+        
+        if pure_prng.prng_algorithms_dict[prng_type]['variable_period']:
+            new_prng_period = 1 << (((p - 1).bit_length() * rounds) << 1)  #Any PRNG should have a period longer than the square of the number of outputs required; set explicitly, because pure_prng keeps the period of variable period algorithms in shared state.
+            prng_instance = pure_prng(seed, prng_type, new_prng_period)
         else:
-            prng_period = algorithm_characteristics_parameter['prng_period']
-            if prng_period != float('+inf'):
-                shuffle_number = calculate_number_of_shuffles_required(list_len, 'shuffle_number', prng_period)
-                if shuffle_number == 1:
-                    prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
-                    prng_instance_rand_int = prng_instance.rand_int
-                    _random_derangement(x, prng_instance_rand_int)
-                else:
-                    output_size = algorithm_characteristics_parameter['output_size']
-                    output_mask = gmpy2_bit_mask(output_size)
-                    seed = rng_util.randomness_extractor(seed, output_size * shuffle_number)
-                    for i in range(shuffle_number):
-                        sub_seed = (seed >> (output_size * i)) & output_mask
-                        prng_instance = pure_prng(sub_seed, prng_type, additional_hash = additional_hash)
-                        prng_instance_rand_int = prng_instance.rand_int
-                        _random_derangement(x, prng_instance_rand_int)
-            else:
-                prng_instance = pure_prng(seed, prng_type, additional_hash = additional_hash)
-                prng_instance_rand_int = prng_instance.rand_int
-                _random_derangement(x, prng_instance_rand_int)
-_dynamic_docstring_of_pr_complete_derangement()
+            prng_instance = pure_prng(seed, prng_type)
+        rand_bits = prng_instance.rand_bits((p - 1).bit_length())  #Rejection sampling over raw bits works at any width, unlike rand_int, which is limited by the period of fixed period algorithms.
+        round_constants = []
+        while len(round_constants) < rounds:
+            round_constant = int(next(rand_bits))
+            if round_constant <= p - 1: round_constants.append(round_constant)
+        self.n = n
+        self.p = p
+        self.exponent = exponent
+        self.round_constants = tuple(round_constants)
+    
+    
+    def permuted_index(self, i: int) -> int:
+        '''
+            Return the value of the permutation at position i.
+            
+            Parameters
+            ----------
+            i: int
+                The position to look up.
+                i must be in range(n)
+        '''
+        if not (0 <= i < self.n): raise IndexError('i must be in range(n)')
+        
+        n = self.n
+        p = self.p
+        exponent = self.exponent
+        round_constants = self.round_constants
+        v = i
+        while True:
+            for round_constant in round_constants:
+                v = (pow(v, exponent, p) + round_constant) % p
+            if v < n: return v
+    
+    
+    def iter_permuted(self, positions: slice = slice(None)) -> Iterator[int]:
+        '''
+            Yield the values of the permutation at the positions selected by a slice of range(n), without building the whole permutation.
+            
+            Parameters
+            ----------
+            positions: slice, default slice(None)
+                The positions to look up. The default is every position in order.
+        '''
+        for i in range(*positions.indices(self.n)):
+            yield self.permuted_index(i)
+
+
+_docstring_fields: Final[dict] = {'default_prng_type': default_prng_type, 'prng_type_tuple': _prng_type_names}
+for _documented_function in (pr_complete_shuffle, pr_complete_shuffle_into, pr_complete_cyclic_permutation, pr_complete_derangement, power_permutation.__init__):
+    _documented_function.__doc__ = _documented_function.__doc__.format_map(_docstring_fields)
+del _documented_function